@@ -1,3 +1,13 @@
-from .registries import Registry, meta_registry, QuerySet, Manager, MultipleObjectsReturned, DoesNotExist
+from .registries import Registry, QuerySet, Manager, MultipleObjectsReturned, DoesNotExist
 
 __version__ = "0.2.1"
+
+
+def __getattr__(name):
+    # keep `persisting_theory.meta_registry` working while deferring its
+    # construction to first access (see registries.__getattr__)
+    if name == 'meta_registry':
+        from .registries import meta_registry
+        globals()['meta_registry'] = meta_registry
+        return meta_registry
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,14 +1,17 @@
-from collections import OrderedDict
-import inspect
+import importlib
+import importlib.util
 import operator
+import sys
 
-try:
-    # use Python3 reload
-    from importlib import reload
 
-except:
-    # we are on Python2
-    pass
+def _cached_import(path):
+    """
+        Return an already-imported module from sys.modules, importing it only on a miss
+    """
+    module = sys.modules.get(path)
+    if module is None:
+        module = importlib.import_module(path)
+    return module
 
 class DoesNotExist(ValueError):
     pass
@@ -17,19 +20,21 @@ class MultipleObjectsReturned(ValueError):
     pass
 
 class QuerySet(object):
+    __slots__ = ('values', '_indexes', '_sorted_cache')
+
     def __init__(self, values):
         self.values = list(values)
+        self._indexes = {}
+        self._sorted_cache = {}
 
     def __iter__(self):
-        for value in self.values:
-            yield value
-        raise StopIteration
+        return iter(self.values)
 
     def __len__(self):
         return len(self.values)
 
     def __repr__(self):
-        return '<{0}: {1}>'.format(self.__class__.__name__, str(list(self.values)))
+        return f'<{self.__class__.__name__}: {list(self.values)}>'
 
     def __getitem__(self, i):
         return self.values[i]
@@ -56,15 +61,20 @@ class QuerySet(object):
         return object_filter
 
     def exists(self):
-        return len(self) > 0
-        
+        return bool(self.values)
+
     def order_by(self, key):
         reverse = False
         if key.startswith('-'):
             reverse = True
             key = key[1:]
 
-        return self._clone(sorted(self.values, key=operator.attrgetter(key), reverse=reverse))
+        cache_key = (key, reverse)
+        ordered = self._sorted_cache.get(cache_key)
+        if ordered is None:
+            ordered = sorted(self.values, key=operator.attrgetter(key), reverse=reverse)
+            self._sorted_cache[cache_key] = ordered
+        return self._clone(ordered)
 
     def all(self):
         return self._clone(self.values)
@@ -84,9 +94,49 @@ class QuerySet(object):
         except IndexError:
             return None
 
+    def _get_index(self, key):
+        """
+            Return an inverted index ({attribute value: [matching objects]}) for
+            the given lookup, building it lazily. Returns None when the lookup
+            cannot be indexed (unhashable values), in which case callers should
+            fall back to a linear scan.
+        """
+        try:
+            return self._indexes[key]
+        except KeyError:
+            pass
+        getter = operator.attrgetter(key.replace('__', '.'))
+        index = {}
+        try:
+            for obj in self.values:
+                index.setdefault(getter(obj), []).append(obj)
+        except TypeError:
+            index = None
+        self._indexes[key] = index
+        return index
+
     def filter(self, **kwargs):
-        _filter = self._build_filter(**kwargs)
-        return self._clone(filter(_filter, self.values))
+        results = None
+        unindexed = {}
+        for key, value in kwargs.items():
+            index = self._get_index(key)
+            try:
+                matches = index.get(value, [])
+            except (TypeError, AttributeError):
+                # unhashable lookup value or unindexable attribute
+                unindexed[key] = value
+                continue
+            if results is None:
+                results = matches
+            else:
+                ids = set(map(id, matches))
+                results = [obj for obj in results if id(obj) in ids]
+        if results is None:
+            results = self.values
+        if unindexed:
+            _filter = self._build_filter(**unindexed)
+            results = [obj for obj in results if _filter(obj)]
+        return self._clone(results)
 
     def exclude(self, **kwargs):
         _filter = self._build_filter(**kwargs)
@@ -104,12 +154,22 @@ class QuerySet(object):
 class Manager(object):
     """Used to retrieve / order / filter preferences pretty much as django's ORM managers"""
 
+    __slots__ = ('registry', 'queryset_class', '_queryset', '_version')
+
     def __init__(self, registry, queryset_class):
         self.registry = registry
         self.queryset_class = queryset_class
+        self._queryset = None
+        self._version = None
 
     def get_queryset(self):
-        return self.queryset_class(self.registry.values())
+        # reuse the queryset (and the indexes it builds) until the registry
+        # content changes; querysets never mutate, they clone
+        version = self.registry._version
+        if self._queryset is None or self._version != version:
+            self._queryset = self.queryset_class(self.registry.values())
+            self._version = version
+        return self._queryset
 
     def all(self):
         return self.get_queryset().all()
@@ -121,22 +181,44 @@ class Manager(object):
             # Try to proxy on queryset if possible
             return getattr(self.get_queryset(), attr)
 
-class Registry(OrderedDict):
+class Registry(dict):
     manager_class = Manager
     queryset_class = QuerySet
 
     def __init__(self, *args, **kwargs):
         super(Registry, self).__init__(*args, **kwargs)
+        self._version = 0
         self.objects = self.manager_class(self, self.queryset_class)
+        self._decorator_cache = {}
+        self._discovery_cache = {}
+        # bind the registration hooks once: register_func then uses plain
+        # attribute loads instead of an MRO walk per registered object
+        self._validate = self.validate
+        self._prepare_name = self.prepare_name
+        self._prepare_data = self.prepare_data
+        self._get_object_name = self.get_object_name
+        # subclasses may still override prepare_data with the historical
+        # single-argument signature: settle which form to call once, here,
+        # rather than probing with a TypeError on every registration
+        import inspect
+        parameters = inspect.signature(self._prepare_data).parameters
+        self._prepare_data_takes_name = 'name' in parameters or any(
+            parameter.kind is inspect.Parameter.VAR_KEYWORD
+            for parameter in parameters.values()
+        )
 
     def register_decorator_factory(self, **kwargs):
         """
             Return an actual decorator for registering objects into registry
         """
         name = kwargs.get('name')
+        cached = self._decorator_cache.get(name)
+        if cached is not None:
+            return cached
         def decorator(decorated):
             self.register_func(data=decorated, name=name)
             return decorated
+        self._decorator_cache[name] = decorator
         return decorator
 
     def register(self, data=None, name=None, **kwargs):
@@ -163,14 +245,11 @@ class Registry(OrderedDict):
         """
             Return a name from an element (object, class, function...)
         """
-        if callable(data):
-            return data.__name__
-
-        elif inspect.isclass(data):
-            return data.__class__.__name__
+        name = getattr(data, '__name__', None)
+        if name is not None:
+            return name
 
-        else:
-            raise ValueError("Cannot deduce name from given object ({0}). Please user registry.register() with a 'name' argument.".format(data))
+        raise ValueError(f"Cannot deduce name from given object ({data}). Please user registry.register() with a 'name' argument.")
 
     def validate(self, data):
         """
@@ -181,20 +260,62 @@ class Registry(OrderedDict):
 
     def prepare_name(self, data, name=None):
         if name is None:
-            return self.get_object_name(data)
+            return self._get_object_name(data)
         return name
 
     def register_func(self, data, name=None, **kwargs):
         """
             Register abritrary data into the registry
         """
-        if self.validate(data):
-            o = self.prepare_data(data)
-            n = self.prepare_name(data, name)
+        if self._validate(data):
+            n = self._prepare_name(data, name)
+            if self._prepare_data_takes_name:
+                o = self._prepare_data(data, name=n)
+            else:
+                o = self._prepare_data(data)
             self[n] = o
-            self.post_register(data=0, name=n)
+            self.post_register(data=data, name=n)
         else:
-            raise ValueError("{0} (type: {0.__class__}) is not a valid value for {1} registry".format(data, self.__class__))
+            raise ValueError(f"{data} (type: {data.__class__}) is not a valid value for {self.__class__} registry")
+
+    # every mutating dict method bumps _version so that cached querysets
+    # (see Manager.get_queryset) never outlive the content they were built from
+
+    def __setitem__(self, key, value):
+        super(Registry, self).__setitem__(key, value)
+        self._version += 1
+
+    def __delitem__(self, key):
+        super(Registry, self).__delitem__(key)
+        self._version += 1
+
+    def pop(self, *args, **kwargs):
+        value = super(Registry, self).pop(*args, **kwargs)
+        self._version += 1
+        return value
+
+    def popitem(self):
+        item = super(Registry, self).popitem()
+        self._version += 1
+        return item
+
+    def update(self, *args, **kwargs):
+        super(Registry, self).update(*args, **kwargs)
+        self._version += 1
+
+    def __ior__(self, other):
+        result = super(Registry, self).__ior__(other)
+        self._version += 1
+        return result
+
+    def setdefault(self, key, default=None):
+        value = super(Registry, self).setdefault(key, default)
+        self._version += 1
+        return value
+
+    def clear(self):
+        super(Registry, self).clear()
+        self._version += 1
 
     def post_register(self, data, name):
         """
@@ -203,42 +324,68 @@ class Registry(OrderedDict):
         """
         pass
 
-    def prepare_data(self, data):
+    def prepare_data(self, data, name=None):
         """
             Override this methode if you want to manipulate data before registering it
             You MUST return a value to register
+            The final registry key is passed as `name`, so overrides that need it
+            do not have to deduce it a second time
         """
         return data
 
 
-    def autodiscover(self, apps, force_reload=False):
+    def autodiscover(self, apps, force_reload=False, parallel=False):
         """
             Iterate throught every installed apps, trying to import `look_into` package
             :param apps: an iterable of string, refering to python modules the registry will try to import via autodiscover
+            :param parallel: probe and import apps from a thread pool, overlapping the
+            filesystem I/O; only use it when discovered modules have no import-order side effects
         """
+        modules = sys.modules
         for app in apps:
-            app_package = __import__(app)
-            try:
+            if modules.get(app) is None:
+                importlib.import_module(app)
+        self._autodiscover_resolved(apps, force_reload=force_reload, parallel=parallel)
 
-                package = '{0}.{1}'.format(app, self.look_into) # try to import self.package inside current app
-                #print(package)
-                module = __import__(package)
-                if force_reload:
-                    reload(module)
-            except ImportError as exc:
-                # From django's syncdb
-                # This is slightly hackish. We want to ignore ImportErrors
-                # if the module itself is missing -- but we don't
-                # want to ignore the exception if the module exists
-                # but raises an ImportError for some reason. The only way we
-                # can do this is to check the text of the exception. Note that
-                # we're a bit broad in how we check the text, because different
-                # Python implementations may not use the same text.
-                # CPython uses the text "No module named"
-                # PyPy uses "No module named myproject.myapp"
-                msg = exc.args[0]
-                if not msg.startswith('No module named') or self.look_into not in msg:
+    def _autodiscover_resolved(self, apps, force_reload=False, parallel=False):
+        """
+            Look for `look_into` submodules, assuming every app package in `apps`
+            is already imported
+        """
+        if parallel:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                # consume the iterator so errors from discovered modules propagate
+                list(executor.map(lambda app: self._discover_app(app, force_reload), apps))
+        else:
+            for app in apps:
+                self._discover_app(app, force_reload)
+
+    def _discover_app(self, app, force_reload=False):
+        package = f'{app}.{self.look_into}' # try to import self.package inside current app
+        found = self._discovery_cache.get(package)
+        if found is None or force_reload:
+            # the app simply has no `look_into` submodule: nothing to discover.
+            # Probing with find_spec avoids raising and string-matching an
+            # ImportError, while real errors inside an existing submodule
+            # still propagate from import_module below.
+            try:
+                found = importlib.util.find_spec(package) is not None
+            except ModuleNotFoundError as exc:
+                if exc.name != package:
+                    # the app itself is missing: a typo'd app name must fail loudly
                     raise
+                # the app is a plain module, not a package: it cannot have submodules
+                found = False
+            self._discovery_cache[package] = found
+        if not found:
+            return
+        module = _cached_import(package)
+        if force_reload:
+            # reload is only needed on this opt-in path, so don't pay
+            # for the import on every `import persisting_theory`
+            from importlib import reload
+            reload(module)
 
 
 class MetaRegistry(Registry):
@@ -256,7 +403,16 @@ class MetaRegistry(Registry):
             self.autodiscover_registries(apps)
 
     def autodiscover_registries(self, apps):
+        # the app packages were already imported by our own autodiscover pass,
+        # so sub-registries can skip the per-app import entirely
         for key, registry in self.items():
-            registry.autodiscover(apps)
-
-meta_registry = MetaRegistry()
+            registry._autodiscover_resolved(apps)
+
+def __getattr__(name):
+    # PEP 562: build the default meta registry on first access instead of at
+    # import time, so `import persisting_theory` allocates nothing
+    if name == 'meta_registry':
+        global meta_registry
+        meta_registry = MetaRegistry()
+        return meta_registry
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -85,6 +85,24 @@ class RegistryTest(unittest.TestCase):
 
         registry.clear()
 
+    def test_registry_can_autodiscover_in_parallel(self):
+
+        registry = test_registries.awesome_people
+        # force_reload: earlier tests may already have imported the app
+        # submodules, whose registrations happen at module execution
+        registry.autodiscover(apps=TEST_APPS, parallel=True, force_reload=True)
+
+        self.assertEqual(len(registry), 2)
+        self.assertNotEqual(registry.get('AlainDamasio', None), None)
+        self.assertNotEqual(registry.get('FrederikPeeters', None), None)
+
+        registry.clear()
+
+    def test_parallel_autodiscover_raises_an_error_if_there_is_an_error_in_imported_module(self):
+        with self.assertRaises(NameError):
+            registry = test_registries.awesome_people
+            registry.autodiscover(apps=('tests.buggy_app',), parallel=True)
+
     def test_autodiscover_raises_an_error_if_there_is_an_error_in_imported_module(self):
         with self.assertRaises(NameError):
             registry = test_registries.awesome_people
@@ -159,6 +177,8 @@ class RegistryTest(unittest.TestCase):
 
 
 class TestObject(object):
+    __slots__ = ('name', 'order', 'a', 'parent')
+
     def __init__(self, name, **kwargs):
         self.name = name
         for key, value in kwargs.items():